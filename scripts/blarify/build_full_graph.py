@@ -29,9 +29,10 @@ root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SCAN_DIRS = ['src', 'tests', 'server', 'mcp-server', 'domain-contracts', 'shared']
 ALLOWED_EXTENSIONS = {'.ts', '.tsx', '.test.ts', '.spec.ts'}
 ALL_COMMON_EXTENSIONS = ['.js', '.cjs', '.mjs', '.d.ts', '.d.map', '.map', '.md', '.txt', '.json', '.yaml', '.yml', '.css', '.scss', '.svg', '.png', '.sh', '.py', '.go', '.rs']
-extensions_to_skip = [ext for ext in ALL_COMMON_EXTENSIONS if ext not in ALLOWED_EXTENSIONS]
-ALL_DIRS = set(os.listdir(root_path))
-names_to_skip = [d for d in ALL_DIRS if d not in SCAN_DIRS and os.path.isdir(os.path.join(root_path, d))]
+extensions_to_skip = sorted(set(ALL_COMMON_EXTENSIONS) - ALLOWED_EXTENSIONS)
+scan_set = set(SCAN_DIRS)
+with os.scandir(root_path) as entries:
+    names_to_skip = [e.name for e in entries if e.name not in scan_set and e.is_dir()]
 names_to_skip.extend(['node_modules', 'dist', '.git', 'coverage', 'test-results', 'playwright-report'])
 
 print("=" * 60)
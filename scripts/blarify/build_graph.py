@@ -61,11 +61,12 @@ ALL_COMMON_EXTENSIONS = [
 ]
 
 # Create skip list: everything NOT in whitelist
-extensions_to_skip = [ext for ext in ALL_COMMON_EXTENSIONS if ext not in ALLOWED_EXTENSIONS]
+extensions_to_skip = sorted(set(ALL_COMMON_EXTENSIONS) - ALLOWED_EXTENSIONS)
 
 # Directories to SKIP (everything except SCAN_DIRS)
-ALL_DIRS = set(os.listdir(root_path))
-names_to_skip = [d for d in ALL_DIRS if d not in SCAN_DIRS and os.path.isdir(os.path.join(root_path, d))]
+scan_set = set(SCAN_DIRS)
+with os.scandir(root_path) as entries:
+    names_to_skip = [e.name for e in entries if e.name not in scan_set and e.is_dir()]
 names_to_skip.extend(['node_modules', 'dist', '.git', 'coverage', 'test-results', 'playwright-report'])
 
 print("=" * 60)
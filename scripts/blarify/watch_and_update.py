@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Watch for file changes and update graph incrementally"""
 import os
-import time
+import threading
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from blarify.prebuilt.graph_builder import GraphBuilder
@@ -15,6 +15,7 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # Whitelist config (same as build_graph.py)
 SCAN_DIRS = ['src', 'tests', 'server', 'mcp-server', 'domain-contracts']
 ALLOWED_EXTENSIONS = {'.ts', '.tsx', '.test.ts', '.spec.ts'}
+ALLOWED_SUFFIXES = tuple(ALLOWED_EXTENSIONS)  # str.endswith takes a tuple
 
 BUILDER = GraphBuilder(
     root_path=PROJECT_ROOT,
@@ -25,61 +26,133 @@ BUILDER = GraphBuilder(
 )
 
 # Debounce: wait 2 seconds after last change before updating
-UPDATED_FILES = []
-DELETED_FILES = []
-LAST_UPDATE_TIME = 0
+DEBOUNCE_SECONDS = 2
+UPDATED_PATHS = set()  # a single save can fire several events for one path
+DELETED_PATHS = set()
+# Guards both queues so a path moves between them, or out to a flush, in one step
+QUEUE_LOCK = threading.Lock()
 
 
 class GraphUpdateHandler(FileSystemEventHandler):
+    def __init__(self):
+        super().__init__()
+        self._timer = None
+        self._stopped = False
+        self._timer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def _arm_flush(self):
+        """Restart the debounce timer so one flush runs after the last event"""
+        with self._timer_lock:
+            if self._stopped:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(DEBOUNCE_SECONDS, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
     def _should_process(self, path):
         """Check if file should be processed based on whitelist"""
-        if 'node_modules' in path:
+        if not path.endswith(ALLOWED_SUFFIXES):
             return False
-        return any(path.endswith(ext) for ext in ALLOWED_EXTENSIONS)
+        # Match node_modules as a path segment, not as part of a file name
+        return 'node_modules' not in os.path.relpath(path, PROJECT_ROOT).split(os.sep)
 
     def on_modified(self, event):
         if event.is_directory or not self._should_process(event.src_path):
             return
         print(f"📝 Changed: {event.src_path}")
-        UPDATED_FILES.append(UpdatedFile(path=event.src_path))
+        with QUEUE_LOCK:
+            DELETED_PATHS.discard(event.src_path)
+            UPDATED_PATHS.add(event.src_path)
+        self._arm_flush()
 
     def on_created(self, event):
         if event.is_directory or not self._should_process(event.src_path):
             return
         print(f"➕ Created: {event.src_path}")
-        UPDATED_FILES.append(UpdatedFile(path=event.src_path))
+        with QUEUE_LOCK:
+            DELETED_PATHS.discard(event.src_path)
+            UPDATED_PATHS.add(event.src_path)
+        self._arm_flush()
 
     def on_deleted(self, event):
-        """Handle file deletions - remove from graph"""
+        """Handle file deletions - queue removal from graph"""
         if event.is_directory or not self._should_process(event.src_path):
             return
         print(f"🗑️ Deleted: {event.src_path}")
-        # Delete nodes for this file from Neo4j
+        with QUEUE_LOCK:
+            # Don't re-parse a file that no longer exists
+            UPDATED_PATHS.discard(event.src_path)
+            DELETED_PATHS.add(event.src_path)
+        self._arm_flush()
+
+    def flush_deletes(self):
+        """Remove all pending deleted files from Neo4j in one query"""
+        with QUEUE_LOCK:
+            # Take the batch out of the queue; deletes during the query queue anew
+            paths = set(DELETED_PATHS)
+            DELETED_PATHS.clear()
+        if not paths:
+            return
+        print(f"\n🗑️ Removing {len(paths)} files from graph...")
         try:
-            DB_MANAGER.query(
-                'MATCH (n:NODE {path: $path, entityId: $entity_id, repoId: $repo_id}) DETACH DELETE n',
-                parameters={'path': event.src_path, 'entity_id': 'kirby', 'repo_id': 'markdown-ticket'}
-            )
-            print(f"   ✅ Removed from graph")
+            # Sessions borrow from the driver's connection pool; execute_write
+            # runs the batch as one transaction and retries transient errors
+            with DB_MANAGER.driver.session() as session:
+                session.execute_write(
+                    lambda tx: tx.run(
+                        'UNWIND $paths AS path '
+                        'MATCH (n:NODE {path: path, entityId: $entity_id, repoId: $repo_id}) DETACH DELETE n',
+                        paths=list(paths), entity_id='kirby', repo_id='markdown-ticket'
+                    ).consume()
+                )
+            print("   ✅ Removed from graph")
         except Exception as e:
             print(f"   ❌ Failed to remove: {e}")
-
-    def schedule_update(self):
-        global LAST_UPDATE_TIME
-        now = time.time()
-
-        if UPDATED_FILES and now - LAST_UPDATE_TIME > 2:
-            print(f"\n🔄 Updating {len(UPDATED_FILES)} files...")
-            try:
-                BUILDER.incremental_update(
-                    updated_files=UPDATED_FILES.copy(),
-                    save_to_db=True
-                )
-                print("✅ Graph updated!")
-                UPDATED_FILES.clear()
-                LAST_UPDATE_TIME = now
-            except Exception as e:
-                print(f"❌ Update failed: {e}")
+            with QUEUE_LOCK:
+                # Requeue the batch, except files recreated in the meantime
+                DELETED_PATHS.update(paths - UPDATED_PATHS)
+            self._arm_flush()  # retry after the debounce delay
+
+    def flush_updates(self):
+        """Re-parse all pending changed files in one incremental update"""
+        with QUEUE_LOCK:
+            # Take the batch out of the queue; saves during the update queue anew
+            paths = set(UPDATED_PATHS)
+            UPDATED_PATHS.clear()
+        if not paths:
+            return
+        print(f"\n🔄 Updating {len(paths)} files...")
+        try:
+            BUILDER.incremental_update(
+                updated_files=[UpdatedFile(path=path) for path in paths],
+                save_to_db=True
+            )
+            print("✅ Graph updated!")
+        except Exception as e:
+            print(f"❌ Update failed: {e}")
+            with QUEUE_LOCK:
+                # Requeue the batch, except files deleted in the meantime
+                UPDATED_PATHS.update(paths - DELETED_PATHS)
+            self._arm_flush()  # retry after the debounce delay
+
+    def flush(self):
+        """Apply queued deletions and updates; runs on the debounce timer"""
+        with self._flush_lock:
+            self.flush_deletes()
+            self.flush_updates()
+
+    def stop(self):
+        """Cancel the pending timer and apply whatever is still queued"""
+        with self._timer_lock:
+            # No new timers from here on, not even a retry of a failed final flush
+            self._stopped = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.flush()
 
 
 if __name__ == "__main__":
@@ -98,12 +171,12 @@ if __name__ == "__main__":
     observer.start()
 
     try:
-        while True:
-            time.sleep(0.5)
-            event_handler.schedule_update()
+        # Flushes run on the handler's debounce timer; nothing to poll here
+        observer.join()
     except KeyboardInterrupt:
         observer.stop()
+        # Let the observer deliver its last events before the final flush
+        observer.join()
+        event_handler.stop()
         print("\n👋 Stopped watching")
         DB_MANAGER.close()
-
-    observer.join()
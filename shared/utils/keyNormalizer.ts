@@ -17,6 +17,12 @@
 
 import { PROJECT_CODE_PATTERN } from '@mdt/domain-contracts'
 
+/** Pure numeric shorthand (e.g., "5", "005", "123") */
+const NUMERIC_KEY_PATTERN = /^\d+$/
+
+/** Full format with project prefix (e.g., "abc-12", "MDT-005", "TP0-002") */
+const FULL_KEY_PATTERN = /^([a-z][a-z0-9]*)-(\d+)$/i
+
 /**
  * Error class for key normalization failures
  */
@@ -61,8 +67,7 @@ export function normalizeKey(key: string, projectCode: string): string {
 
   // Pattern 1: Pure numeric (e.g., "5", "005", "123")
   // Add project prefix and pad to 3 digits (matching ticket format)
-  const numericPattern = /^\d+$/
-  if (numericPattern.test(trimmed)) {
+  if (NUMERIC_KEY_PATTERN.test(trimmed)) {
     // Pad to 3 digits and add project prefix
     return formatCrKey(projectCode, Number.parseInt(trimmed, 10))
   }
@@ -70,8 +75,7 @@ export function normalizeKey(key: string, projectCode: string): string {
   // Pattern 2: Full format with project prefix (e.g., "abc-12", "MDT-005", "TP0-002")
   // Uses PROJECT_CODE_PATTERN from domain-contracts for validation
   // Must start with a letter, followed by alphanumeric characters
-  const fullFormatPattern = /^([a-z][a-z0-9]*)-(\d+)$/i
-  const match = trimmed.match(fullFormatPattern)
+  const match = FULL_KEY_PATTERN.exec(trimmed)
 
   if (match) {
     const [, prefix, numberStr] = match